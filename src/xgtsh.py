@@ -18,33 +18,77 @@
 #===----------------------------------------------------------------------===#
 
 import argparse
+import bisect
 import cmd
-import getpass
+import collections
+import concurrent.futures
+import operator
 import os
 import pprint
 import sys
+import tempfile
+import time
 import warnings
 
-import xgt
+# The xgt client library is heavy to import, and getpass may touch the
+# password database; both are loaded on first use rather than at startup.
+xgt = None
 
-try:
-  import pandas as pd
-  HASPANDAS=True
-except:
-  HASPANDAS = False
+# pandas is imported lazily on first use; pulling it in at startup adds
+# hundreds of milliseconds to every invocation, including ones that never
+# display query results.
+_PANDAS = None
 
-# import the linux or windows version of readline for auto completion
-READLINE_DEFINED = False
-try:
+def _get_pandas():
+  """Import pandas on first use, returning the module or None"""
+  global _PANDAS
+  if _PANDAS is None:
+    try:
+      import pandas
+      _PANDAS = pandas
+    except:
+      _PANDAS = False
+  return _PANDAS if _PANDAS else None
+
+def _try_load_readline():
+  """Import the linux or windows readline module for auto completion,
+  returning the module or None.  Loaded lazily since non-interactive runs
+  never need it."""
+  try:
     import readline
-    READLINE_DEFINED = True
-except:
+    return readline
+  except:
     pass
-try:
-    import pyreadline
-    READLINE_DEFINED = True
-except:
+  try:
+    import pyreadline as readline
+    return readline
+  except:
+    return None
+
+#----------------------------------------------------------------------------
+
+# Frames the server creates for its own bookkeeping; hidden unless verbose.
+_XGT_INTERNAL_PREFIX = 'xgt__'
+
+# Resolved once at import; expanduser can hit the password database.
+_HISTFILE = os.path.join(os.path.expanduser("~"), ".xgthist")
+
+# C-level sort key; avoids a Python lambda call per comparison.
+_JOB_ID = operator.attrgetter('id')
+
+def _coerce_config_value(value:str):
+  """Convert a config value string to bool, int, or float when possible"""
+  lowered = value.lower()
+  if lowered == 'true' or lowered == 'false':
+    return lowered == 'true'
+  try:
+    return int(value)
+  except ValueError:
     pass
+  try:
+    return float(value)
+  except ValueError:
+    return value
 
 #----------------------------------------------------------------------------
 
@@ -54,8 +98,28 @@ class XgtCli(cmd.Cmd):
   """
   original_prompt = 'xGT>> '
   prompt = original_prompt
-
-  def __init__(self, host, port, username, verbose = False, debug = False):
+  # How long (in seconds) a cached namespace list stays fresh for completion.
+  namespace_cache_ttl = 3.0
+  # How long (in seconds) a cached server configuration stays fresh.
+  config_cache_ttl = 2.0
+  # Most recent history entries loaded and kept in ~/.xgthist.
+  history_length = 5000
+  # Result-set size above which do_query shows only a preview.
+  query_display_limit = 1000
+  # Optional per-job detail fields shown by the job command, as
+  # (attribute, display label) pairs; missing or empty values are skipped.
+  job_detail_fields = (
+      ('description', 'description'),
+      ('query_plan', 'query plan'),
+      ('visited_edges', 'visited edges'),
+      ('total_visited_edges', 'total visited'),
+      ('timing', 'timing'),
+      ('_timing', '_timing'),
+      ('schema', 'schema'),
+      )
+
+  def __init__(self, host, port, username, verbose = False, debug = False,
+               non_interactive = False):
     super().__init__()
 
     self.__username = username
@@ -63,88 +127,165 @@ class XgtCli(cmd.Cmd):
     self.__hostname = host
     self.__verbose = verbose
     self.__debug = debug
+    self.__non_interactive = non_interactive
+    self.__readline = None
+    self.__history_saved = 0
+    self.__ns_cache = (0.0, None)
+    self.__config_cache = (0.0, None)
+    self.__parsers = self.__build_parsers()
     if self.__debug:
       warnings.simplefilter("default")
     else:
       warnings.simplefilter("ignore")
     self.__server = self.__connect_to_server()
+    self.__version_tuple = (
+        int(xgt.__version_major__),
+        int(xgt.__version_minor__),
+        int(xgt.__version_patch__),
+        )
 
-    if READLINE_DEFINED:
+    # One-shot invocations never touch the history or completion machinery,
+    # so only an interactive session loads readline and its history file.
+    if not non_interactive and sys.stdin.isatty():
+      self.__readline = _try_load_readline()
+    if self.__readline is not None:
+      rl = self.__readline
       # --- make sure tab completion works on a MAC
-      if 'libedit' in readline.__doc__:
-        readline.parse_and_bind("bind ^I rl_complete")
-      self.__old_completer_delims = readline.get_completer_delims()
-      readline.set_completer_delims(' =')
+      if rl.__doc__ and 'libedit' in rl.__doc__:
+        rl.parse_and_bind("bind ^I rl_complete")
+      self.__old_completer_delims = rl.get_completer_delims()
+      rl.set_completer_delims(' =')
       # ----- keep history of commands between runs
-      histfile = os.path.join(os.path.expanduser("~"), ".xgthist")
+      self.__read_history(_HISTFILE)
+      if hasattr(rl, 'append_history_file'):
+        # Append the new entries as commands run (see postcmd) so exit
+        # does not rewrite the whole history file.
+        open(_HISTFILE, 'a').close()
+        self.__history_saved = rl.get_current_history_length()
+      else:
+        import atexit
+        atexit.register(rl.write_history_file, _HISTFILE)
+
+  def __read_history(self, histfile) -> None:
+    """Load command history, reading only the most recent entries"""
+    rl = self.__readline
+    rl.set_history_length(self.history_length)
+    try:
+      with open(histfile, 'rb') as f:
+        lines = collections.deque(f, maxlen=self.history_length + 1)
+    except IOError:
+      return
+    if len(lines) <= self.history_length:
       try:
-        readline.read_history_file(histfile)
+        rl.read_history_file(histfile)
       except IOError:
         pass
-      import atexit
-      atexit.register(readline.write_history_file, histfile)
+      return
+    # The history has outgrown the cap; feed readline only the tail so
+    # startup does not slow down linearly with the file size.
+    lines.popleft()
+    with tempfile.NamedTemporaryFile(delete=False) as tmp:
+      tmp.writelines(lines)
+    try:
+      rl.read_history_file(tmp.name)
+    except IOError:
+      pass
+    finally:
+      os.remove(tmp.name)
 
   def __del__(self):
-    if READLINE_DEFINED:
-      readline.set_completer_delims(self.__old_completer_delims)
+    if getattr(self, '_XgtCli__readline', None) is not None:
+      self.__readline.set_completer_delims(self.__old_completer_delims)
 
   def emptyline(self):
     pass
 
+  def precmd(self, line)->str:
+    # Fast-path blank input before onecmd's parsing machinery runs.
+    if not line or line.isspace():
+      return ''
+    return line
+
+  def postcmd(self, stop, line)->bool:
+    rl = self.__readline
+    if rl is not None and hasattr(rl, 'append_history_file'):
+      current = rl.get_current_history_length()
+      new_items = current - self.__history_saved
+      if new_items > 0:
+        try:
+          rl.append_history_file(new_items, _HISTFILE)
+          self.__history_saved = current
+        except OSError:
+          pass
+    return stop
+
   def _namespace_complete(self, text, line, begidx, endidx) -> tuple:
-    if self.__verbose:
+    # Printing inside a completer forces a readline redraw per TAB press,
+    # so this trace is tied to the debug toggle rather than verbose mode.
+    if self.__debug:
       print(f"\nnamespace_completion: text: {text}, line: {line}, begidx: {begidx}, endidx: {endidx}")
 
     if self.__server is None:
       return []
 
-    namespaces = self.__server.get_namespaces()
-    return [_ for _ in namespaces if _.startswith(text)]
+    namespaces = self.__cached_namespaces()
+    if not text:
+      return list(namespaces)
+    # The cache is sorted, so the matches form a contiguous run whose
+    # bounds both come from binary searches: every name with this prefix
+    # sorts before the prefix followed by the largest code point.
+    lo = bisect.bisect_left(namespaces, text)
+    hi = bisect.bisect_left(namespaces, text + chr(sys.maxunicode), lo)
+    return list(namespaces[lo:hi])
+
+  def __cached_namespaces(self) -> tuple:
+    """Return the namespace list, reusing a recent copy to avoid an RPC per TAB press"""
+    (timestamp, namespaces) = self.__ns_cache
+    now = time.monotonic()
+    if namespaces is None or now - timestamp >= self.namespace_cache_ttl:
+      namespaces = tuple(sorted(self.__rpc('get_namespaces')))
+      self.__ns_cache = (now, namespaces)
+    return namespaces
+
+  def __invalidate_namespace_cache(self) -> None:
+    self.__ns_cache = (0.0, None)
 
 
   def do_cancel(self, line)->bool:
     """Cancel a job"""
-    if self.__server is None:
-      print("Not connected to a server")
-      return False
-    fields = line.split()
-    if len(fields) < 1:
-      print(f"Usage: {self.prompt} cancel <job-id>")
+    if not self.__require_server():
       return False
-    try:
-      job_id = int(fields[0])
-    except:
-      print(f"Usage: {self.prompt} cancel <job-id>")
-      print("where:  <job-id> must be an integer")
-      return False
-    self.__server.cancel_job(job_id)
+    args = self.__parse_command('cancel', line)
+    if args is not None:
+      self.__server.cancel_job(args.job_id)
     return False
 
   def do_config(self, line)->bool:
     """Show server configuration"""
-    if self.__server is None:
-      print("Not connected to a server")
+    if not self.__require_server():
+      return False
+    fields = line.split()
+    if len(fields) < 1:
+      (timestamp, items) = self.__config_cache
+      now = time.monotonic()
+      if items is None or now - timestamp >= self.config_cache_ttl:
+        config = self.__rpc('get_config')
+        items = tuple(sorted(config.items()))
+        self.__config_cache = (now, items)
+    elif len(fields) >= 4 and fields[0] == 'set' and fields[2] == '=':
+      param = fields[1]
+      value = _coerce_config_value(fields[3])
+      try:
+        self.__server.set_config({param: value})
+        self.__config_cache = (0.0, None)
+      except xgt.XgtError as e:
+        print(f"Error: {e}")
+      return False
     else:
-      fields = line.split()
-      if len(fields) < 1:
-        config = self.__server.get_config()
-      elif fields[0] == 'set' and fields[2] == '=':
-        param = fields[1]
-        value = fields[3]
-        if value.lower() == 'false' or value.lower() == 'true':
-          value = value.lower() == 'true'
-        elif value.isnumeric() or (value[0] == '-' and value[1:].isnumeric()):
-          value = int(value)
-        try:
-          self.__server.set_config({param: value})
-        except xgt.XgtError as e:
-          print(f"Error: {e}")
-        return False
-      else:
-        print(f"Unknown config parameters: {fields}")
-        return False
+      print(f"Unknown config parameters: {fields}")
+      return False
 
-      print("\n".join([f"{k} = {v}" for k,v in sorted(config.items())]))
+    sys.stdout.writelines(f"{k} = {v}\n" for k, v in items)
     return False
 
   def do_debug(self, line)->bool:
@@ -159,15 +300,22 @@ class XgtCli(cmd.Cmd):
 
   def do_default_namespace(self, line)->bool:
     """Show or set default namespace"""
+    if not self.__require_server():
+      return False
     if len(line) < 1:
       print(f"Default namespace: {self.__server.get_default_namespace()}")
     else:
       self.__server.set_default_namespace(line)
+      # Setting the default can introduce a namespace the server did not
+      # have before; make the completer see it right away.
+      self.__invalidate_namespace_cache()
     return False
   complete_default_namespace = _namespace_complete
 
   def do_drop(self, line)->bool:
     """Drop a frame"""
+    if not self.__require_server():
+      return False
     if len(line) < 1:
       print(f"Command:  DROP <frame-name>")
     else:
@@ -197,10 +345,12 @@ class XgtCli(cmd.Cmd):
       xGT>> job <start-job-number> (<end-job-number>)
 
     """
-    if self.__server is None:
-      print("Not connected to a server")
+    if not self.__require_server():
       return False
-    self.__process_job_command(line)
+    args = self.__parse_command('job', line)
+    if args is not None:
+      end_job = args.end_job if args.end_job is not None else args.start_job
+      self.__process_job_command(args.start_job, end_job)
     return False
 
   def do_jobs(self, line)->bool:
@@ -211,142 +361,175 @@ class XgtCli(cmd.Cmd):
 
     If the optional <state> parameter is provided, show only jobs in that state
     """
-    if self.__server is None:
-      print("Not connected to a server")
+    if not self.__require_server():
       return False
-    jobs = self.__server.get_jobs()
-    jobs_map = {_.id:_ for _ in jobs}
-    for job_id in sorted([_.id for _ in jobs]):
-      job = jobs_map[job_id]
-      if len(line) < 1 or job.status == line:
-        print(f"{job_id:3d}: {jobs_map[job_id]}")
+    want_status = line.strip() or None
+    for job in sorted(self.__rpc('get_jobs'), key=_JOB_ID):
+      if want_status is None or job.status == want_status:
+        print(f"{job.id:3d}: {job}")
     return False
 
   def do_memory(self, line)->bool:
     """Show server memory status"""
-    if self.__server is None:
-      print("Not connected to a server")
-    else:
-      max_memory = self.__server.max_user_memory_size
-      footprint = max_memory - self.__server.free_user_memory_size
-      print(f"Current RAM footprint: {footprint:,.3f} GiB used out of {max_memory:,.3f} GiB available.")
+    if not self.__require_server():
+      return False
+    max_memory = self.__server.max_user_memory_size
+    footprint = max_memory - self.__server.free_user_memory_size
+    print(f"Current RAM footprint: {footprint:,.3f} GiB used out of {max_memory:,.3f} GiB available.")
     return False
 
   def do_namespaces(self, line)->bool:
     """Show current namespaces"""
-    if self.__server is None:
-      print("Not connected to a server")
-    else:
-      namespaces = self.__server.get_namespaces()
-      print(", ".join(namespaces))
+    if not self.__require_server():
+      return False
+    namespaces = self.__rpc('get_namespaces')
+    print(", ".join(namespaces))
     return False
 
   def do_query(self, line:str)->bool:
     """Run a query"""
-    if self.__server is None:
-      print("Not connected to a server")
+    if not self.__require_server():
+      return False
+    # run_job is deliberately not routed through __rpc: a query can mutate
+    # data, so a connection lost mid-query must surface as an error rather
+    # than silently re-executing the query on a fresh connection.
+    job = self.__server.run_job(line)
+    num_rows = getattr(job, 'num_rows', None)
+    if num_rows is not None and num_rows > self.query_display_limit:
+      # Only a screenful is useful; don't pull millions of rows over the
+      # wire to display the first few.
+      for row in job.get_data(0, 20):
+        pprint.pprint(row)
+      print(f"({num_rows:,} rows total, showing the first 20)")
+    elif _get_pandas() is not None:
+      df = job.get_data_pandas()
+      print(df)
     else:
-      job = self.__server.run_job(line)
-      if HASPANDAS:
-        df = job.get_data_pandas()
-        print(df)
-      else:
-        data = job.get_data()
-        pprint.pprint(data)
+      data = job.get_data()
+      pprint.pprint(data)
     return False
 
   def do_save(self, line:str)->bool:
     """Save a frame to a file"""
-    fields = line.split()
-    if len(fields) < 2:
-      print(f"Usage: {self.prompt} save <frame-name> <filename>")
+    args = self.__parse_command('save', line)
+    if args is None:
       return False
-    frame_name = fields[0]
-    filename = fields[1]
-    try:
-      frame = self.__server.get_frame(frame_name)
-    except:
-      print(f"Frame {frame_name} does not exist")
+    frame = self.__lookup_frame(args.frame_name)
+    if frame is None:
+      print(f"Frame {args.frame_name} does not exist")
       return False
-    frame.save(filename, headers=True)
+    frame.save(args.filename, headers=True)
     return False
 
   def do_schema(self, line)->bool:
     """Show schema of specified frame"""
     frame_name = line
+    frame = self.__lookup_frame(frame_name)
+    if frame is None:
+      print(f"Frame {frame_name} does not exist")
+      return False
     print(f"Showing schema of frame {frame_name}")
-    is_edge = False
-    try:
-      frame = self.__server.get_edge_frame(frame_name)
-      is_edge = True
-    except:
-      try:
-        frame = self.__server.get_vertex_frame(frame_name)
-      except:
-        try:
-          frame = self.__server.get_table_frame(frame_name)
-        except:
-          print(f"Frame {frame_name} does not exist")
-          return False
-    schema = frame.schema
-    print(f"Schema: {schema}")
-    if is_edge:
-      print(f"Source frame: {frame.source_name}, Target frame: {frame.target_name}")
+    print(f"Schema: {frame.schema}")
+    # Only edge frames have endpoints; one getattr probe each instead of a
+    # hasattr check followed by a second fetch.
+    source = getattr(frame, 'source_name', None)
+    target = getattr(frame, 'target_name', None)
+    if source is not None and target is not None:
+      print(f"Source frame: {source}, Target frame: {target}")
     return False
 
   def do_scroll(self, line)->bool:
-    """Scroll through frame data"""
-    frame_name = line
-    try:
-      frame = self.__server.get_edge_frame(frame_name)
-    except:
-      try:
-        frame = self.__server.get_vertex_frame(frame_name)
-      except:
-        try:
-          frame = self.__server.get_table_frame(frame_name)
-        except:
-          print(f"Frame {frame_name} does not exist")
-          return False
+    """
+    Scroll through frame data one page at a time
+
+      xGT>> scroll <frame-name> (<page-size>)
+
+    Press Enter (or y) for the next page; n stops.  The default page
+    size is 20 rows.  Only the displayed pages are fetched from the
+    server.
+    """
+    args = self.__parse_command('scroll', line)
+    if args is None:
+      return False
+    if args.page_size < 1:
+      print("scroll: <page-size> must be a positive integer")
+      return False
+    frame = self.__lookup_frame(args.frame_name)
+    if frame is None:
+      print(f"Frame {args.frame_name} does not exist")
+      return False
+    page_size = args.page_size
     offset = 0
-    data = frame.get_data(offset, 20)
     print("Data:")
-    for row in data:
-      pprint.pprint(row)
+    while True:
+      data = frame.get_data(offset, page_size)
+      for row in data:
+        pprint.pprint(row)
+      if not data or len(data) < page_size:
+        break
+      offset += page_size
+      try:
+        answer = input("more? [Y/n] ")
+      except EOFError:
+        print("")
+        break
+      if answer.strip().lower().startswith('n'):
+        break
     return False
 
   def do_show(self, line)->bool:
     """Show graph information in the running xGT server"""
-    if self.__server is None:
-      print("Not connected to a server")
+    if not self.__require_server():
       return False
-    fields = line.split()
-    if len(fields) < 1:
-      print(f"Usage: {self.prompt} show <namespace>")
+    args = self.__parse_command('show', line)
+    if args is None:
       return False
-    ns = str(fields[0])
-
-    tables = self.__server.get_frames(namespace=ns, frame_type='table')
-    total_table_rows = 0
-    for table in tables:
-      if self.__verbose or not table.name.startswith('xgt__'):
-        total_table_rows += table.num_rows
-        print(f"TableFrame {table.name} has {table.num_rows:,} rows")
-    print(f"Total table rows over all frames: {total_table_rows:,}")
-    vertices = self.__server.get_frames(namespace=ns, frame_type='vertex')
-    total_vertices = 0
-    for vertex in vertices:
-      if self.__verbose or not vertex.name.startswith('xgt__'):
-        total_vertices += vertex.num_rows
-        print(f"VertexFrame {vertex.name} has {vertex.num_vertices:,} vertices")
-    print(f"Total vertices over all frames: {total_vertices:,}")
-    edges = self.__server.get_frames(namespace=ns, frame_type='edge')
-    total_edges = 0
-    for edge in edges:
-      if self.__verbose or not edge.name.startswith('xgt__'):
-        total_edges += edge.num_edges
-        print(f"EdgeFrame {edge.name} has {edge.num_edges:,} edges")
-    print(f"Total edges over all frames: {total_edges:,}")
+    ns = args.namespace
+
+    if self.__version_is_since(1, 14, 0):
+      # One catalog RPC returns every frame; partition by kind locally.
+      tables = []
+      vertices = []
+      edges = []
+      kinds = {'TableFrame': tables, 'VertexFrame': vertices,
+               'EdgeFrame': edges}
+      for frame in self.__rpc('get_frames', namespace=ns):
+        bucket = kinds.get(type(frame).__name__)
+        if bucket is not None:
+          bucket.append(frame)
+    else:
+      # Overlap the three catalog RPCs instead of paying three round trips.
+      with concurrent.futures.ThreadPoolExecutor(max_workers=3) as executor:
+        (tables, vertices, edges) = executor.map(
+            lambda frame_type: self.__server.get_frames(namespace=ns,
+                                                        frame_type=frame_type),
+            ('table', 'vertex', 'edge'))
+
+    # Filter out internal frames once instead of re-testing inside each loop.
+    tables = self.__visible_frames(tables)
+    vertices = self.__visible_frames(vertices)
+    edges = self.__visible_frames(edges)
+    labels_map = self.__prefetch_frame_labels(tables + vertices + edges)
+
+    # Each size property can be a round trip; fetch them all concurrently
+    # and print from the prefetched lists.
+    with concurrent.futures.ThreadPoolExecutor(max_workers=32) as executor:
+      table_rows = list(executor.map(lambda f: f.num_rows, tables))
+      vertex_counts = list(executor.map(lambda f: f.num_vertices, vertices))
+      edge_counts = list(executor.map(lambda f: f.num_edges, edges))
+
+    for (table, num_rows) in zip(tables, table_rows):
+      labels = self.__frame_labels_str(labels_map, table.name)
+      print(f"TableFrame {table.name} has {num_rows:,} rows{labels}")
+    print(f"Total table rows over all frames: {sum(table_rows):,}")
+    for (vertex, num_vertices) in zip(vertices, vertex_counts):
+      labels = self.__frame_labels_str(labels_map, vertex.name)
+      print(f"VertexFrame {vertex.name} has {num_vertices:,} vertices{labels}")
+    print(f"Total vertices over all frames: {sum(vertex_counts):,}")
+    for (edge, num_edges) in zip(edges, edge_counts):
+      labels = self.__frame_labels_str(labels_map, edge.name)
+      print(f"EdgeFrame {edge.name} has {num_edges:,} edges{labels}")
+    print(f"Total edges over all frames: {sum(edge_counts):,}")
 
     return False
   complete_show = _namespace_complete
@@ -371,47 +554,215 @@ class XgtCli(cmd.Cmd):
 
   def do_zap(self, line)->bool:
     """Zap a namespace"""
-    if self.__server is None:
-      print("Not connected to a server")
+    if not self.__require_server():
       return False
-    fields = line.split()
-    if len(fields) < 1:
-      print(f"Usage: {self.prompt} zap <namespace>")
+    args = self.__parse_command('zap', line)
+    if args is None:
       return False
-    ns = str(fields[0])
+    ns = args.namespace
 
     if self.__version_is_since(1, 14, 0):
       frames = self.__server.get_frames(namespace=ns)
       self.__server.drop_frames(frames)
       deleted_frames = len(frames)
     else:
-      edges = self.__server.get_edge_frames(namespace=ns)
-      for edge in edges:
-        self.__server.drop_frame(edge)
-        if self.__verbose:
-          print(f"EdgeFrame {edge.name} deleted")
+      # Fetch the three frame lists concurrently; old clients have no
+      # single catalog call covering all kinds.
+      with concurrent.futures.ThreadPoolExecutor(max_workers=3) as executor:
+        (edges, tables, vertices) = executor.map(
+            lambda getter: getter(namespace=ns),
+            (self.__server.get_edge_frames,
+             self.__server.get_table_frames,
+             self.__server.get_vertex_frames))
+      # Edges must go before vertices, so drop concurrently within each
+      # phase but keep the phases themselves in order.
+      self.__drop_frames_concurrently(edges)
       self.__server.wait_for_metrics()
-      tables = self.__server.get_table_frames(namespace=ns)
-      for table in tables:
-        self.__server.drop_frame(table)
-        if self.__verbose:
-          print(f"TableFrame {table.name} deleted")
-      vertices = self.__server.get_vertex_frames(namespace=ns)
-      for vertex in vertices:
-        self.__server.drop_frame(vertex)
-        if self.__verbose:
-          print(f"VertexFrame {vertex.name} deleted")
+      # Tables and vertices have no interdependency once the edges are
+      # gone, so they form a single combined batch.
+      self.__drop_frames_concurrently(tables + vertices)
       deleted_frames = len(tables) + len(vertices) + len(edges)
 
+    self.__invalidate_namespace_cache()
     print(f"Deleted {deleted_frames} frames in namespace {ns}")
     return False
   complete_zap = _namespace_complete
 
+  def __rpc(self, method, *args, **kwargs):
+    """Call an idempotent connection method, reconnecting once if the link
+    went stale.  Never route mutating calls (e.g. run_job) through this:
+    the retry re-executes them."""
+    connection_error = getattr(xgt, 'XgtConnectionError', xgt.XgtError)
+    try:
+      return getattr(self.__server, method)(*args, **kwargs)
+    except connection_error:
+      # The server may have restarted or dropped an idle connection; try
+      # one transparent reconnect before surfacing the error.
+      server = self.__connect_to_server()
+      if server is None:
+        raise
+      self.__server = server
+      self.__invalidate_namespace_cache()
+      self.__config_cache = (0.0, None)
+      return getattr(self.__server, method)(*args, **kwargs)
+
+  def __require_server(self) -> bool:
+    """Report whether a server connection exists, printing a message if not"""
+    if self.__server is None:
+      print("Not connected to a server")
+      return False
+    return True
+
+  def __build_parsers(self) -> dict:
+    """Build the reusable per-command argument parsers once"""
+    parsers = {}
+    def add(name, *arguments):
+      parser = argparse.ArgumentParser(prog=name, add_help=False)
+      for (arg_name, kwargs) in arguments:
+        parser.add_argument(arg_name, **kwargs)
+      parsers[name] = parser
+    add('cancel', ('job_id', dict(type=int)))
+    add('job', ('start_job', dict(type=int)),
+        ('end_job', dict(type=int, nargs='?', default=None)))
+    add('save', ('frame_name', dict()), ('filename', dict()))
+    add('scroll', ('frame_name', dict()),
+        ('page_size', dict(type=int, nargs='?', default=20)))
+    add('show', ('namespace', dict()))
+    add('zap', ('namespace', dict()))
+    return parsers
+
+  def __parse_command(self, command, line):
+    """Parse a command line with its prebuilt parser, or None on bad usage"""
+    try:
+      return self.__parsers[command].parse_args(line.split())
+    except SystemExit:
+      return None
+
+  def __lookup_frame(self, name):
+    """Resolve a frame of any type by name, returning it or None.
+
+    Uses the single catalog lookup when the client provides one rather
+    than probing each frame type with its own round trip and exception.
+    """
+    if self.__server is None:
+      return None
+    if hasattr(self.__server, 'get_frame'):
+      try:
+        return self.__server.get_frame(name)
+      except:
+        return None
+    for getter in (self.__server.get_edge_frame,
+                   self.__server.get_vertex_frame,
+                   self.__server.get_table_frame):
+      try:
+        return getter(name)
+      except:
+        pass
+    return None
+
+  def __drop_frames_concurrently(self, frames) -> None:
+    """Drop a batch of frames, overlapping the per-frame round trips"""
+    if len(frames) < 1:
+      return
+    with concurrent.futures.ThreadPoolExecutor(max_workers=8) as executor:
+      futures = [(frame, executor.submit(self.__server.drop_frame, frame))
+                 for frame in frames]
+      for (frame, future) in futures:
+        future.result()
+        if self.__verbose:
+          print(f"{type(frame).__name__} {frame.name} deleted")
+
+  def __visible_frames(self, frames) -> list:
+    """Filter out the server's internal frames unless in verbose mode"""
+    if self.__verbose:
+      return frames
+    return [_ for _ in frames if not _.name.startswith(_XGT_INTERNAL_PREFIX)]
+
+  def __prefetch_frame_labels(self, frames) -> dict:
+    """Fetch security labels for all frames concurrently, keyed by frame name"""
+    if not self.__verbose or not hasattr(self.__server, 'get_frame_labels'):
+      return {}
+    names = [frame.name for frame in frames]
+    # One round trip per frame would be latency-bound; overlap them instead.
+    with concurrent.futures.ThreadPoolExecutor(max_workers=16) as executor:
+      return dict(zip(names,
+                      executor.map(self.__server.get_frame_labels, names)))
+
+  def __frame_labels_str(self, labels_map, name) -> str:
+    labels = labels_map.get(name)
+    if not labels:
+      return ""
+    return f", labels: {labels}"
+
+  #------------------------- Non-interactive entry points
+  def execute_command_and_exit(self, command:str) -> None:
+    """Run a single console command, then return"""
+    line = command.strip()
+    if len(line) < 1 or line[0] == '#':
+      return
+    # partition is a single C-level scan; split builds a throwaway list.
+    (cmd_name, _, cmd_args) = line.partition(' ')
+    self.onecmd(f"{cmd_name} {cmd_args}".rstrip())
+
+  def execute_file_and_exit(self, filename:str) -> None:
+    """Run each console command from a file, then return"""
+    try:
+      with open(filename, 'r') as f:
+        script = f.readlines()
+    except IOError as exc:
+      print(f"Unable to read command file {filename}:\n{exc}")
+      return
+    for line in script:
+      line = line.strip()
+      if len(line) < 1 or line[0] == '#':
+        continue
+      (cmd_name, _, cmd_args) = line.partition(' ')
+      if self.onecmd(f"{cmd_name} {cmd_args}".rstrip()):
+        break
+
+  def execute_query_and_exit(self, query:str, output_format:str = 'table') -> None:
+    """Run a single query, print the results, and return"""
+    if not self.__require_server():
+      return
+    job = self.__server.run_job(query)
+    # Fetch the schema once; each access could be a server round trip.
+    schema = getattr(job, 'schema', None)
+    columns = [field[0] for field in schema] if schema else None
+    if output_format == 'json':
+      import json
+      json.dump(job.get_data(), sys.stdout, indent=2, default=str)
+      sys.stdout.write('\n')
+    elif output_format == 'csv':
+      pd = _get_pandas()
+      if pd is not None and hasattr(job, 'get_data_pandas'):
+        # pandas streams the rows to stdout rather than building the whole
+        # CSV in memory first.
+        job.get_data_pandas().to_csv(sys.stdout, index=False)
+      else:
+        import csv
+        writer = csv.writer(sys.stdout)
+        if columns is not None:
+          writer.writerow(columns)
+        writer.writerows(job.get_data())
+    else:
+      pd = _get_pandas()
+      if pd is not None and hasattr(job, 'get_data_pandas'):
+        print(job.get_data_pandas())
+      elif pd is not None:
+        df = pd.DataFrame.from_records(iter(job.get_data()), columns=columns)
+        print(df)
+      else:
+        pprint.pprint(job.get_data())
+
   #------------------------- Utility Functions
-  def __connect_to_server(self, password=None) -> xgt.Connection:
+  def __connect_to_server(self, password=None):
     """Establish a connection to the xGT server"""
+    global xgt
+    if xgt is None:
+      import xgt
     conn = None
     if password:
+      import getpass
       try:
         conn = xgt.Connection(port = self.__port,
                               host = self.__hostname,
@@ -434,77 +785,45 @@ class XgtCli(cmd.Cmd):
         print(f"Unable to connect to xgtd server:\n{exc}")
     return conn
 
-  def __process_job_command(self, line) -> None:
-    fields = line.split()
-    if len(fields) < 1 or len(fields) > 2:
-      print(f"Command format: job <job_id> (<end-job-number>)")
-      return None
-
-    try:
-      start_job = int(fields[0])
-      if len(fields) > 1:
-        end_job = int(fields[1])
-      else:
-        end_job = start_job
-    except:
-      print(f"Command format: job <job_id> (<end-job-number>)")
-      return None
-
-    jobs = self.__server.get_jobs()
-    jobs_map = {_.id:_ for _ in jobs}
-    for j in range(start_job, end_job+1):
-      if j in jobs_map:
-        job = jobs_map[j]
-        print(f"Job #{job.id}, username: {job.user}, status {job.status}:")
-
-#       if job.status == 'unknown_job_status':
-#         return None
-
-        if job.status == 'running':
-          print(f"  start time: {job.start_time}")
-        elif job.status != 'scheduled':
-          duration = job.end_time - job.start_time
-          print(f"    start time: {job.start_time}")
-          print(f"      end time: {job.end_time}")
-          print(f"      duration: {duration}")
-        if len(job.description) > 0:
-          print(f"   description: {job.description}")
-        if 'query_plan' in dir(job) and len(job.query_plan) > 0:
-          print(f"   query plan: {job.query_plan}")
-        if job.visited_edges is not None and len(job.visited_edges) > 0:
-          print(f" visited edges: {job.visited_edges}")
-        if job.total_visited_edges is not None:
-          print(f" total visited: {job.total_visited_edges}")
-        if 'timing' in dir(job) and job.timing is not None and len(job.timing) > 0:
-          print(f"        timing:")
-          for line in job.timing:
-            print(line)
-        if '_timing' in dir(job) and job._timing is not None and len(job._timing) > 0:
-          print(f"       _timing:")
-          for line in job._timing:
-            print(line)
-        if job.schema is not None and len(job.schema) > 0:
-          print(f"       schema: {job.schema}")
+  def __process_job_command(self, start_job, end_job) -> None:
+    jobs = self.__rpc('get_jobs')
+    selected = [job for job in sorted(jobs, key=_JOB_ID)
+                if start_job <= job.id <= end_job]
+    if len(selected) > 1:
+      # Warm each job's remote attributes concurrently so the print loop
+      # reads client-cached values instead of paying one round trip per
+      # attribute per job.
+      def _warm(job):
+        return (job.status, job.description, getattr(job, 'schema', None))
+      with concurrent.futures.ThreadPoolExecutor(max_workers=8) as executor:
+        collections.deque(executor.map(_warm, selected), maxlen=0)
+    for job in selected:
+      print(f"Job #{job.id}, username: {job.user}, status {job.status}:")
+
+#     if job.status == 'unknown_job_status':
+#       return None
+
+      if job.status == 'running':
+        print(f"  start time: {job.start_time}")
+      elif job.status != 'scheduled':
+        duration = job.end_time - job.start_time
+        print(f"    start time: {job.start_time}")
+        print(f"      end time: {job.end_time}")
+        print(f"      duration: {duration}")
+      for (attr, label) in self.job_detail_fields:
+        value = getattr(job, attr, None)
+        if value is None or (hasattr(value, '__len__') and len(value) == 0):
+          continue
+        if attr in ('timing', '_timing'):
+          print(f"{label:>14}:")
+          for timing_line in value:
+            print(timing_line)
+        else:
+          print(f"{label:>14}: {value}")
     return None
 
   def __version_is_since(self, major, minor, patch):
-    (v1, v2, v3) = self.__version()
-    if v1 > major:
-      return True
-    if v1 < major:
-      return False
-    if v2 > minor:
-      return True
-    if v2 < minor:
-      return False
-    return v3 >= patch
-
-  def __version(self) -> (int):
-    return (
-        int(xgt.__version_major__),
-        int(xgt.__version_minor__),
-        int(xgt.__version_patch__),
-        )
+    return self.__version_tuple >= (major, minor, patch)
 
 #----------------------------------------------------------------------------
 
@@ -513,19 +832,41 @@ if __name__ == '__main__' :
   parser = argparse.ArgumentParser(
       prog=name,
       description='Command-line interface to Trovares xGT server')
+  parser.add_argument('-c', '--command', type=str,
+      help="run this single console command and exit")
   parser.add_argument('-d', '--debug', action='store_true',
       help="show debug information")
+  parser.add_argument('-f', '--file', type=str,
+      help="run console commands from this file and exit")
+  parser.add_argument('--format', type=str, default='table',
+      choices=['table', 'json', 'csv'],
+      help="output format for --query results, default='table'")
   parser.add_argument('--host', type=str, default='localhost',
       help="connect to this host name, default='localhost'")
   parser.add_argument('-p', '--port', type=int, default=4367,
       help='connect to this port, default=4367')
-  parser.add_argument('-u', '--user', type=str,
-      default=getpass.getuser(),
-      help=f"username to use for the connection, default '{getpass.getuser()}'")
+  parser.add_argument('-q', '--query', type=str,
+      help="run this query, print the results, and exit")
+  parser.add_argument('-u', '--user', type=str, default=None,
+      help="username to use for the connection, default is the current user")
   parser.add_argument('-v', '--verbose', action='store_true',
       help="show detailed information")
   options = parser.parse_args(sys.argv[1:])
+  if options.user is None:
+    import getpass
+    options.user = getpass.getuser()
 
+  non_interactive = (options.command is not None or
+                     options.file is not None or
+                     options.query is not None)
   instance = XgtCli(host=options.host, port=options.port, username=options.user,
-                    verbose=options.verbose, debug=options.debug)
-  instance.cmdloop()
+                    verbose=options.verbose, debug=options.debug,
+                    non_interactive=non_interactive)
+  if options.command is not None:
+    instance.execute_command_and_exit(options.command)
+  elif options.file is not None:
+    instance.execute_file_and_exit(options.file)
+  elif options.query is not None:
+    instance.execute_query_and_exit(options.query, options.format)
+  else:
+    instance.cmdloop()